@@ -1,3 +1,5 @@
+import numpy as np
+
 GMT_COLOR_NAMES = {
     # R   G   B   Name
     'snow': (255, 250, 250),
@@ -663,4 +665,9 @@ GMT_COLOR_NAMES = {
     'grey99': (252, 252, 252),
     'gray100': (255, 255, 255),
     'grey100': (255, 255, 255),
-}
\ No newline at end of file
+}
+
+# companion structures for fast numeric lookups: a (N, 3) float table
+# holding all colors and a name -> row index map into it
+GMT_COLOR_TABLE = np.array(list(GMT_COLOR_NAMES.values()), dtype=np.float32)
+GMT_NAME_INDEX = {name: i for i, name in enumerate(GMT_COLOR_NAMES)}